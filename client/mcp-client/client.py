@@ -1,91 +1,239 @@
 import asyncio
+import io
+import itertools
 import json
+import logging
 import sys
+import threading
 import time
 import uuid
+from collections import deque
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
-from typing import Dict, List, Optional, Any
-from contextlib import AsyncExitStack
+from queue import Queue
+from typing import Dict, List, Any
+from contextlib import AsyncExitStack, suppress
 
-from mcp.client.sse import sse_client
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
 
-from anthropic import Anthropic
 from dotenv import load_dotenv
-import tomllib
 
 
 load_dotenv()
 MODEL = "claude-sonnet-4-20250514"
+SUMMARY_MODEL = "claude-3-5-haiku-latest"
+CACHE_CONTROL = {"type": "ephemeral"}
+SUMMARY_MESSAGE_CHARS = 2000  # Tope por mensaje en el prompt del resumen
+
+
+def with_cache_breakpoint(messages: List[Dict]) -> List[Dict]:
+    """Marca el último turno con cache_control para que Claude reutilice el prefijo en la siguiente llamada"""
+    if not messages:
+        return messages
+
+    last = messages[-1]
+    content = last["content"]
+    blocks = [{"type": "text", "text": content}] if isinstance(content, str) else list(content)
+    if not blocks or not isinstance(blocks[-1], dict):
+        return messages
+
+    blocks[-1] = {**blocks[-1], "cache_control": CACHE_CONTROL}
+    return messages[:-1] + [{**last, "content": blocks}]
+
+
+def tool_result_text(result) -> str:
+    """Aplana el contenido de una respuesta MCP a texto para el tool_result de Claude"""
+    blocks = result.content
+    # Caso habitual: un único bloque de texto
+    if len(blocks) == 1 and hasattr(blocks[0], "text"):
+        return blocks[0].text
+    return "".join(getattr(block, "text", str(block)) for block in blocks)
+
+
+async def ainput(prompt: str = "") -> str:
+    """input() sin bloquear el event loop: lee stdin en un hilo daemon"""
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def resolve(setter, value):
+        if not future.done():
+            setter(value)
+
+    def read_line():
+        try:
+            line = input(prompt)
+        except BaseException as e:
+            loop.call_soon_threadsafe(resolve, future.set_exception, e)
+        else:
+            loop.call_soon_threadsafe(resolve, future.set_result, line)
+
+    # Daemon: un input() pendiente no impide que el proceso termine
+    threading.Thread(target=read_line, daemon=True).start()
+    return await future
 
 class ConversationContext:
     """Maneja el contexto de la conversación"""
     
     def __init__(self):
         self.conversation_id = str(uuid.uuid4())[:12]
-        self.messages = []
-        self.max_context_messages = 10  # Mantener últimos 10 intercambios
+        self.messages = deque()
+        self._claude_view = deque()  # Mismos mensajes, ya con el formato {"role", "content"} de Claude
+        self._user_count = 0
+        self._assistant_count = 0
+        self.max_context_messages = 10  # Mantener al menos los últimos 10 intercambios literales
+        # Intercambios que la ventana puede crecer antes de recortarse: mientras crece, cada
+        # consulta extiende el prefijo de la anterior y aprovecha la caché de prompts
+        self.cache_buffer_messages = 20
+        # Presupuesto de caracteres (~3 caracteres por token, 180k de los 200k tokens de la ventana de Claude)
+        self.char_budget = 3 * 180_000
+        self._total_chars = 0
+        self.history_summary = ""
+        # Mensajes expulsados aún sin resumir (el tope solo aplica al devolver lo de un resumen fallido)
+        self.pending_summary: List[Dict] = []
+        # Primer mensaje del usuario (instrucciones iniciales, identidad): se fija al salir de la ventana
+        self.anchor_message: Dict | None = None
+        self._anchor_view: Dict | None = None
     
     def add_user_message(self, content: str):
         """Añade mensaje del usuario"""
-        self.messages.append({
+        self._append({
             "role": "user",
             "content": content,
-            "timestamp": datetime.now().isoformat()
+            "ts_ns": time.time_ns()
         })
-        self._trim_context()
     
     def add_assistant_message(self, content: str, tools_used: List[str] = None):
         """Añade mensaje del asistente"""
         message = {
             "role": "assistant", 
             "content": content,
-            "timestamp": datetime.now().isoformat()
+            "ts_ns": time.time_ns()
         }
         if tools_used:
             message["tools_used"] = tools_used
         
+        self._append(message)
+    
+    def _append(self, message: Dict):
+        """Añade el mensaje al historial y a la vista para Claude"""
         self.messages.append(message)
+        self._claude_view.append({"role": message["role"], "content": message["content"]})
+        self._track(message, 1)
         self._trim_context()
     
+    def _track(self, message: Dict, delta: int):
+        """Actualiza contadores por rol y de caracteres al añadir (+1) o expulsar (-1) un mensaje"""
+        self._total_chars += delta * len(message["content"])
+        if message["role"] == "user":
+            self._user_count += delta
+        else:
+            self._assistant_count += delta
+    
     def _trim_context(self):
-        """Mantiene solo los últimos N mensajes para no sobrecargar el contexto"""
-        if len(self.messages) > self.max_context_messages * 2:  # user + assistant = 2 mensajes
-            self.messages = self.messages[-(self.max_context_messages * 2):]
+        """Al agotar el buffer de caché, recorta la ventana y mueve lo expulsado a pending_summary"""
+        window = self.max_context_messages * 2  # user + assistant = 2 mensajes
+        if len(self.messages) > window + self.cache_buffer_messages * 2:
+            evicted = len(self.messages) - window
+            evicted += evicted % 2  # El contexto siempre debe empezar con un mensaje del usuario
+            for _ in range(evicted):
+                self._evict_oldest()
+        
+        # Un mensaje enorme (p. ej. un resultado de herramienta) no debe desbordar el contexto
+        while self._total_chars > self.char_budget and len(self.messages) > 2:
+            self._evict_oldest()
+            if self.messages[0]["role"] == "assistant":
+                self._evict_oldest()
+    
+    def _evict_oldest(self):
+        """Expulsa el mensaje más antiguo de la ventana y lo deja pendiente de resumir"""
+        message = self.messages.popleft()
+        view = self._claude_view.popleft()
+        if self.anchor_message is None and message["role"] == "user":
+            # El ancla sigue enviándose a Claude, así que conserva sus contadores y caracteres.
+            # Nunca se expulsa: se recorta a un cuarto del presupuesto para que por sí sola no
+            # lo mantenga excedido y vacíe la ventana en cada turno
+            max_anchor_chars = self.char_budget // 4
+            if len(view["content"]) > max_anchor_chars:
+                view = {"role": "user", "content": view["content"][:max_anchor_chars]}
+                self._total_chars -= len(message["content"]) - max_anchor_chars
+            self.anchor_message = message
+            self._anchor_view = view
+            return
+        self._track(message, -1)
+        self.pending_summary.append(message)
+    
+    @staticmethod
+    def format_timestamp(ts_ns: int) -> str:
+        """Formatea (solo al leer) el timestamp en nanosegundos de un mensaje como YYYY-MM-DDTHH:MM:SS"""
+        return datetime.fromtimestamp(ts_ns / 1e9).isoformat(timespec="seconds")
+    
+    def take_pending_summary(self) -> List[Dict]:
+        """Entrega los mensajes pendientes de resumir y vacía la cola"""
+        pending, self.pending_summary = self.pending_summary, []
+        return pending
+    
+    def restore_pending_summary(self, messages: List[Dict]):
+        """Devuelve a la cola los mensajes de un resumen fallido, por delante de los expulsados después"""
+        # Tope = ventana completa (el mayor lote que puede expulsarse de una vez): fallos repetidos
+        # no hacen crecer el prompt sin límite, se descartan los mensajes más antiguos
+        max_pending = (self.max_context_messages + self.cache_buffer_messages) * 2
+        self.pending_summary = (messages + self.pending_summary)[-max_pending:]
+    
+    def apply_summary(self, summary: str):
+        """Reemplaza el resumen previo"""
+        self.history_summary = summary
     
     def get_context_for_claude(self) -> List[Dict]:
-        """Obtiene el contexto formateado para Claude"""
-        context_messages = []
-        for msg in self.messages:
-            if msg["role"] in ["user", "assistant"]:
-                context_messages.append({
-                    "role": msg["role"],
-                    "content": msg["content"]
-                })
-        return context_messages
+        """Obtiene el contexto formateado para Claude (copia: process_query le añade los turnos de herramientas)"""
+        if self._anchor_view is None:
+            return list(self._claude_view)
+        # La API une turnos consecutivos del mismo rol, así que el ancla puede preceder a la ventana
+        return [self._anchor_view, *self._claude_view]
     
     def get_summary(self) -> str:
         """Obtiene un resumen de la conversación actual"""
         if not self.messages:
             return f"Conversación {self.conversation_id}: Sin mensajes"
         
-        user_msgs = len([m for m in self.messages if m["role"] == "user"])
-        assistant_msgs = len([m for m in self.messages if m["role"] == "assistant"])
-        
+        first = self.anchor_message or self.messages[0]
         return f"""
 === Conversación Actual: {self.conversation_id} ===
-• Mensajes del usuario: {user_msgs}
-• Respuestas del asistente: {assistant_msgs}
-• Total de mensajes: {len(self.messages)}
-• Iniciada: {self.messages[0]["timestamp"] if self.messages else "N/A"}
+• Mensajes del usuario: {self._user_count}
+• Respuestas del asistente: {self._assistant_count}
+• Total de mensajes: {len(self.messages) + (self.anchor_message is not None)}
+• Iniciada: {self.format_timestamp(first["ts_ns"])}
 """
 
     def clear(self):
         """Limpia la conversación actual y crea una nueva"""
         self.conversation_id = str(uuid.uuid4())[:12]
-        self.messages = []
+        self.messages = deque()
+        self._claude_view = deque()
+        self._user_count = 0
+        self._assistant_count = 0
+        self._total_chars = 0
+        self.history_summary = ""
+        self.pending_summary = []
+        self.anchor_message = None
+        self._anchor_view = None
+
+class InteractionLogFormatter(logging.Formatter):
+    """Formato "[YYYY-MM-DD HH:MM:SS] LEVEL [conv_id] mensaje" con el timestamp cacheado por segundo"""
+    
+    def __init__(self):
+        super().__init__("[%(asctime)s] %(label)s %(conv_id)s %(message)s")
+        self._cached_second = None
+        self._cached_timestamp = ""
+    
+    def formatTime(self, record, datefmt=None):
+        # Una consulta genera varias entradas en el mismo segundo: formatear solo cuando cambia
+        second = int(record.created)
+        if second != self._cached_second:
+            self._cached_second = second
+            self._cached_timestamp = datetime.fromtimestamp(second).isoformat(sep=' ', timespec='seconds')
+        return self._cached_timestamp
 
 class InteractionLogger:
     """Maneja el logging de todas las interacciones"""
@@ -93,6 +241,20 @@ class InteractionLogger:
     def __init__(self, log_file: str = "mcp_interactions.txt"):
         self.log_file = Path(log_file)
         self.ensure_log_file()
+        
+        # La escritura a disco ocurre en el hilo del QueueListener, no en el event loop
+        self._file_handler = RotatingFileHandler(
+            self.log_file, maxBytes=10_000_000, backupCount=3, encoding='utf-8'
+        )
+        self._file_handler.setFormatter(InteractionLogFormatter())
+        log_queue = Queue(-1)
+        self._listener = QueueListener(log_queue, self._file_handler)
+        self._listener.start()
+        
+        self._logger = logging.getLogger("mcp_interactions")
+        self._logger.handlers = [QueueHandler(log_queue)]
+        self._logger.setLevel(logging.INFO)
+        self._logger.propagate = False
     
     def ensure_log_file(self):
         """Asegura que el archivo de log existe"""
@@ -101,12 +263,12 @@ class InteractionLogger:
     
     def _write_log(self, level: str, message: str, conversation_id: str = None):
         """Escribe una entrada en el log"""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         conv_id = f"[{conversation_id}]" if conversation_id else ""
-        log_entry = f"[{timestamp}] {level} {conv_id} {message}\n"
-        
-        with open(self.log_file, 'a', encoding='utf-8') as f:
-            f.write(log_entry)
+        self._logger.log(
+            logging.ERROR if level == "ERROR" else logging.INFO,
+            message,
+            extra={"label": level, "conv_id": conv_id}
+        )
         
         # También mostrar en consola para INFO
         if level == "INFO":
@@ -148,13 +310,15 @@ class InteractionLogger:
         """Log de cierre del sistema"""
         self._write_log("SHUTDOWN", "MCP Client shutting down")
     
+    def close(self):
+        """Escribe las entradas pendientes y cierra el archivo de log"""
+        self._listener.stop()
+        self._file_handler.close()
+    
     def get_recent_logs(self, lines: int = 50) -> str:
         """Obtiene las líneas más recientes del log"""
         try:
-            with open(self.log_file, 'r', encoding='utf-8') as f:
-                all_lines = f.readlines()
-            
-            recent_lines = all_lines[-lines:] if len(all_lines) > lines else all_lines
+            recent_lines = self._tail_lines(lines)
             
             if not recent_lines:
                 return "No hay logs disponibles"
@@ -163,6 +327,23 @@ class InteractionLogger:
         
         except Exception as e:
             return f"Error leyendo logs: {str(e)}"
+    
+    def _tail_lines(self, lines: int) -> List[str]:
+        """Lee las últimas N líneas del log sin cargar el archivo completo"""
+        size = self.log_file.stat().st_size
+        
+        # Archivos grandes: saltar directamente cerca del final (~300 bytes por línea)
+        if size > 1_000_000:
+            with open(self.log_file, 'rb') as raw:
+                raw.seek(max(0, size - lines * 300))
+                raw.readline()  # Descarta la primera línea, probablemente cortada
+                recent_lines = list(deque(io.TextIOWrapper(raw, encoding='utf-8', errors='replace'), maxlen=lines))
+            if len(recent_lines) == lines:
+                return recent_lines
+        
+        # deque con maxlen: solo las últimas N líneas quedan en memoria
+        with open(self.log_file, 'r', encoding='utf-8') as f:
+            return list(deque(f, maxlen=lines))
 
 class ServerConfig:
     """Configuration for a single MCP server"""
@@ -198,11 +379,17 @@ class MCPMultiClient:
     def __init__(self):
         self.sessions: Dict[str, ClientSession] = {}
         self.exit_stack = AsyncExitStack()
+        # Import diferido: el SDK de Anthropic es pesado y no se necesita para mostrar el uso
+        from anthropic import Anthropic
         self.anthropic = Anthropic()
         self.available_tools: List[Dict] = []
+        self.tools_by_name: Dict[str, Dict] = {}
+        self._tools_by_server: Dict[str, List[Dict]] = {}
+        self._claude_tools: List[Dict] = []
         
         # Inicializar contexto y logging
         self.context = ConversationContext()
+        self._summary_task: asyncio.Task | None = None
         self.logger = InteractionLogger()
         
         # Log de inicio
@@ -220,7 +407,9 @@ class MCPMultiClient:
             with open(config_file, 'r', encoding='utf-8') as f:
                 config_data = json.load(f)
         elif config_file.suffix.lower() in ['.toml', '.tml']:
-            if tomllib is None:
+            try:
+                import tomllib
+            except ImportError:
                 raise ImportError("TOML support requires 'tomli' package. Install with: pip install tomli")
             with open(config_file, 'rb') as f:
                 config_data = tomllib.load(f)
@@ -240,7 +429,8 @@ class MCPMultiClient:
         """Connect to all enabled servers from configuration"""
         servers_config = self.load_config(config_path)
         
-        connected_servers = []
+        # Lanzar los procesos de todos los servidores sin esperar a que respondan
+        opened_sessions: Dict[str, ClientSession] = {}
         
         for server_name, server_config in servers_config.items():
             if not server_config.enabled:
@@ -248,48 +438,65 @@ class MCPMultiClient:
                 continue
                 
             try:
-                server_params = server_config.to_server_params()
-                stdio_transport = await self.exit_stack.enter_async_context(
-                    stdio_client(server_params)
-                )
-                stdio, write = stdio_transport
-                
-                session = await self.exit_stack.enter_async_context(
-                    ClientSession(stdio, write)
-                )
-                await session.initialize()
-                
-                self.sessions[server_name] = session
-                connected_servers.append(server_name)
-                
-                # Get tools from this server
-                response = await session.list_tools()
-                server_tools = []
-                tool_names = []
-                
-                for tool in response.tools:
-                    tool_info = {
-                        "name": f"{tool.name}",
-                        "description": f"[{server_name}] {tool.description}",
-                        "input_schema": tool.inputSchema,
-                        "_server": server_name,
-                        "_original_name": tool.name
-                    }
-                    server_tools.append(tool_info)
-                    self.available_tools.append(tool_info)
-                    tool_names.append(tool.name)
-                
-                self.logger.log_server_connection(server_name, "CONNECTED", tool_names)
-                
+                opened_sessions[server_name] = await self._open_stdio_session(server_config)
             except Exception as e:
                 self.logger.log_server_connection(server_name, f"FAILED - {str(e)}")
         
+        # Inicializar en paralelo: el arranque tarda lo que el servidor más lento, no la suma
+        results = await asyncio.gather(
+            *(self._initialize_session(session) for session in opened_sessions.values()),
+            return_exceptions=True
+        )
+        
+        connected_servers = []
+        
+        for (server_name, session), result in zip(opened_sessions.items(), results):
+            if isinstance(result, BaseException):
+                self.logger.log_server_connection(server_name, f"FAILED - {str(result)}")
+                continue
+            
+            self.sessions[server_name] = session
+            connected_servers.append(server_name)
+            
+            # Get tools from this server
+            tool_names = []
+            
+            for tool in result:
+                tool_info = {
+                    "name": f"{tool.name}",
+                    "description": f"[{server_name}] {tool.description}",
+                    "input_schema": tool.inputSchema,
+                    "_server": server_name,
+                    "_original_name": tool.name
+                }
+                self._register_tool(tool_info)
+                tool_names.append(tool.name)
+            
+            self.logger.log_server_connection(server_name, "CONNECTED", tool_names)
+        
         if not connected_servers:
             raise RuntimeError("No servers could be connected")
         
+        self._build_claude_tools()
+        
         print(f"✅ Successfully connected to {len(connected_servers)} server(s)")
         print(f"🔧 Total available tools: {len(self.available_tools)}")
     
+    async def _open_stdio_session(self, server_config: ServerConfig) -> ClientSession:
+        """Start a stdio server process and open its session (without initializing it)"""
+        stdio, write = await self.exit_stack.enter_async_context(
+            stdio_client(server_config.to_server_params())
+        )
+        return await self.exit_stack.enter_async_context(
+            ClientSession(stdio, write)
+        )
+    
+    async def _initialize_session(self, session: ClientSession) -> List[Any]:
+        """Run the MCP handshake and return the server's tools"""
+        await session.initialize()
+        response = await session.list_tools()
+        return response.tools
+    
     async def connect_to_single_server(self, server_url: str = "http://127.0.0.1:8000/sse"):
         """Connect to a single SSE server (backward compatibility)"""
         headers = {
@@ -297,6 +504,8 @@ class MCPMultiClient:
             'Cache-Control': 'no-cache'
         }
         
+        from mcp.client.sse import sse_client
+        
         try:
             sse_transport = await self.exit_stack.enter_async_context(
                 sse_client(server_url, headers=headers)
@@ -315,132 +524,197 @@ class MCPMultiClient:
             response = await session.list_tools()
             tool_names = []
             for tool in response.tools:
-                self.available_tools.append({
+                tool_info = {
                     "name": tool.name,
                     "description": tool.description,
                     "input_schema": tool.inputSchema,
                     "_server": server_name,
                     "_original_name": tool.name
-                })
+                }
+                self._register_tool(tool_info)
                 tool_names.append(tool.name)
 
+            self._build_claude_tools()
             self.logger.log_server_connection(server_name, "CONNECTED", tool_names)
             
         except Exception as e:
             self.logger.log_server_connection("taylor", f"FAILED - {str(e)}")
             raise
 
+    def _register_tool(self, tool_info: Dict):
+        """Registra una herramienta y la indexa por nombre (original y el saneado que ve Claude)"""
+        tool_info["_claude_name"] = tool_info["name"].replace(".", "_")
+        self.available_tools.append(tool_info)
+        self.tools_by_name[tool_info["name"]] = tool_info
+        self.tools_by_name[tool_info["_claude_name"]] = tool_info
+        self._tools_by_server.setdefault(tool_info["_server"], []).append(tool_info)
+
+    def _build_claude_tools(self):
+        """Prepara una sola vez las definiciones de herramientas para Claude"""
+        self._claude_tools = [
+            {
+                "name": tool["_claude_name"],
+                "description": tool["description"],
+                "input_schema": tool["input_schema"]
+            }
+            for tool in self.available_tools
+        ]
+        
+        # Breakpoint de caché al final del bloque de herramientas (estable entre consultas)
+        if self._claude_tools:
+            self._claude_tools[-1]["cache_control"] = CACHE_CONTROL
+
+    def _create_message(self, messages: List[Dict]):
+        """Llama a Claude en streaming (con herramientas, resumen previo y breakpoint de caché) e imprime el texto a medida que llega"""
+        params = {
+            "model": MODEL,
+            "max_tokens": 1500,
+            "messages": with_cache_breakpoint(messages),
+            "tools": self._claude_tools
+        }
+        if self.context.history_summary:
+            params["system"] = f"Resumen previo de la conversación:\n{self.context.history_summary}"
+        
+        streamed = False
+        with self.anthropic.messages.stream(**params) as stream:
+            for text in stream.text_stream:
+                print(text, end="", flush=True)
+                streamed = True
+            response = stream.get_final_message()
+        
+        if streamed:
+            print()
+        return response
+
+    def _schedule_summary(self):
+        """Lanza en segundo plano el resumen de los mensajes expulsados; se aplica en un turno posterior"""
+        if not self.context.pending_summary:
+            return
+        if self._summary_task is not None and not self._summary_task.done():
+            return  # Lo expulsado mientras tanto se resume en la próxima tarea
+        
+        self._summary_task = asyncio.create_task(
+            self._update_summary(self.context.take_pending_summary(), self.context.conversation_id)
+        )
+    
+    async def _update_summary(self, pending: List[Dict], conversation_id: str):
+        """Condensa en el resumen los mensajes que salieron de la ventana de contexto"""
+        transcript = "\n".join(
+            f"{'Usuario' if msg['role'] == 'user' else 'Asistente'}: {msg['content'][:SUMMARY_MESSAGE_CHARS]}"
+            for msg in pending
+        )
+        prompt = (
+            f"Resumen actual:\n{self.context.history_summary or '(vacío)'}\n\n"
+            f"Mensajes nuevos:\n{transcript}\n\n"
+            "Actualiza el resumen de forma concisa, conservando hechos, decisiones y datos relevantes. "
+            "Responde solo con el resumen."
+        )
+        
+        try:
+            # El cliente de Anthropic es síncrono: la llamada va en un hilo para no congelar el event loop
+            response = await asyncio.to_thread(
+                self.anthropic.messages.create,
+                model=SUMMARY_MODEL,
+                max_tokens=500,
+                messages=[{"role": "user", "content": prompt}]
+            )
+            # Si la conversación se limpió mientras tanto, el resumen ya no aplica
+            if self.context.conversation_id == conversation_id:
+                self.context.apply_summary(response.content[0].text)
+        except Exception as e:
+            self.logger.log_error(e, "update_summary", conversation_id)
+            # Se reintenta en el próximo turno junto con lo expulsado mientras tanto
+            if self.context.conversation_id == conversation_id:
+                self.context.restore_pending_summary(pending)
+
+    async def _run_tool(self, tool_use) -> tuple:
+        """Ejecuta un tool_use en su servidor MCP; devuelve (tool_result, marcador, herramienta usada)"""
+        tool_name = tool_use.name
+        tool_args = tool_use.input
+        tool_result = {"type": "tool_result", "tool_use_id": tool_use.id}
+
+        # Busca la herramienta correcta en el índice de herramientas
+        tool_info = self.tools_by_name.get(tool_name)
+
+        if not tool_info:
+            error_msg = f"[Error: Tool {tool_name} not found]"
+            print(error_msg)
+            self.logger.log_error(
+                Exception(f"Tool not found: {tool_name}"), 
+                "tool_lookup", 
+                self.context.conversation_id
+            )
+            return {**tool_result, "content": error_msg, "is_error": True}, error_msg, None
+
+        server_name = tool_info["_server"]
+        original_tool_name = tool_info["_original_name"]
+        tool_used = f"{tool_name}@{server_name}"
+
+        # Llamada segura al servidor
+        try:
+            session = self.sessions[server_name]
+            result = await session.call_tool(original_tool_name, tool_args)
+
+            # Log de la llamada exitosa
+            self.logger.log_tool_call(
+                tool_name, server_name, tool_args, True, self.context.conversation_id
+            )
+
+            call_msg = f"[✅ Called {tool_name} on {server_name}]"
+            print(call_msg)
+            return {**tool_result, "content": tool_result_text(result)}, call_msg, tool_used
+
+        except Exception as e:
+            error_msg = f"[❌ Error calling {tool_name}: {str(e)}]"
+            print(error_msg)
+            
+            # Log del error
+            self.logger.log_tool_call(
+                tool_name, server_name, tool_args, False, self.context.conversation_id
+            )
+            self.logger.log_error(e, f"tool_call_{tool_name}", self.context.conversation_id)
+            return {**tool_result, "content": error_msg, "is_error": True}, error_msg, tool_used
+
     async def process_query(self, query: str) -> str:
         """Process a query using Claude and available tools with full context"""
-        import copy
-        
-        start_time = time.time()
+        start_time = time.perf_counter()
         tools_used = []
         
         # Log de la consulta del usuario
         self.logger.log_user_query(query, self.context.conversation_id)
         self.context.add_user_message(query)
+        self._schedule_summary()
 
         # Obtener contexto completo de la conversación
         messages = self.context.get_context_for_claude()
 
-        # Prepara herramientas para Claude
-        claude_tools = []
-        for tool in self.available_tools:
-            valid_name = tool["name"].replace(".", "_")
-            claude_tool = {
-                "name": valid_name,
-                "description": tool["description"],
-                "input_schema": tool["input_schema"]
-            }
-            claude_tools.append(claude_tool)
-
         try:
             # Llamada inicial a Claude con contexto completo
-            response = self.anthropic.messages.create(
-                model=MODEL,
-                max_tokens=1500,
-                messages=messages,
-                tools=claude_tools
-            )
+            response = self._create_message(messages)
+
+            final_text = [content.text for content in response.content if content.type == "text"]
+            tool_uses = [content for content in response.content if content.type == "tool_use"]
+
+            if tool_uses:
+                # Las herramientas pedidas en una misma respuesta son independientes: ejecutarlas en paralelo
+                async with asyncio.TaskGroup() as tg:
+                    tasks = [tg.create_task(self._run_tool(tool_use)) for tool_use in tool_uses]
 
-            final_text = []
-            assistant_message_content = []
-
-            # Procesa la respuesta de Claude
-            for content in response.content:
-                if content.type == "text":
-                    final_text.append(content.text)
-                    assistant_message_content.append(content)
-
-                elif content.type == "tool_use":
-                    tool_name = content.name
-                    tool_args = content.input
-
-                    # Busca la herramienta correcta en available_tools
-                    tool_info = next((t for t in self.available_tools if t["name"] == tool_name), None)
-
-                    if not tool_info:
-                        error_msg = f"[Error: Tool {tool_name} not found]"
-                        final_text.append(error_msg)
-                        self.logger.log_error(
-                            Exception(f"Tool not found: {tool_name}"), 
-                            "tool_lookup", 
-                            self.context.conversation_id
-                        )
-                        continue
-
-                    server_name = tool_info["_server"]
-                    original_tool_name = tool_info["_original_name"]
-                    tools_used.append(f"{tool_name}@{server_name}")
-
-                    # Llamada segura al servidor
-                    try:
-                        session = self.sessions[server_name]
-                        result = await session.call_tool(original_tool_name, tool_args)
-
-                        # Log de la llamada exitosa
-                        self.logger.log_tool_call(
-                            tool_name, server_name, tool_args, True, self.context.conversation_id
-                        )
-
-                        final_text.append(f"[✅ Called {tool_name} on {server_name}]")
-
-                        # Actualiza mensajes para Claude con el resultado del tool
-                        assistant_message_content.append(content)
-                        messages.append({
-                            "role": "assistant",
-                            "content": copy.deepcopy(assistant_message_content)
-                        })
-                        messages.append({
-                            "role": "user",
-                            "content": [{
-                                "type": "tool_result",
-                                "tool_use_id": content.id,
-                                "content": result.content
-                            }]
-                        })
-
-                        # Obtener siguiente respuesta de Claude
-                        response = self.anthropic.messages.create(
-                            model=MODEL,
-                            max_tokens=1500,
-                            messages=messages,
-                            tools=claude_tools
-                        )
-
-                        if response.content and response.content[0].text:
-                            final_text.append(response.content[0].text)
-
-                    except Exception as e:
-                        error_msg = f"[❌ Error calling {tool_name}: {str(e)}]"
-                        final_text.append(error_msg)
-                        
-                        # Log del error
-                        self.logger.log_tool_call(
-                            tool_name, server_name, tool_args, False, self.context.conversation_id
-                        )
-                        self.logger.log_error(e, f"tool_call_{tool_name}", self.context.conversation_id)
+                tool_results = []
+                for task in tasks:
+                    tool_result, marker, tool_used = task.result()
+                    tool_results.append(tool_result)
+                    final_text.append(marker)
+                    if tool_used:
+                        tools_used.append(tool_used)
+
+                # Un solo turno de seguimiento con todos los resultados
+                messages.append({"role": "assistant", "content": response.content})
+                messages.append({"role": "user", "content": tool_results})
+
+                # Obtener siguiente respuesta de Claude
+                response = self._create_message(messages)
+                final_text.extend(content.text for content in response.content if content.type == "text")
 
             response_text = "\n".join(final_text)
             
@@ -450,7 +724,7 @@ class MCPMultiClient:
             # Log de la respuesta
             self.logger.log_assistant_response(response_text, self.context.conversation_id, tools_used)
             
-            duration = time.time() - start_time
+            duration = time.perf_counter() - start_time
             print(f"⏱️  Query processed in {duration:.2f}s")
             
             return response_text
@@ -458,6 +732,7 @@ class MCPMultiClient:
         except Exception as e:
             self.logger.log_error(e, "process_query", self.context.conversation_id)
             error_response = f"❌ Error processing query: {str(e)}"
+            print(error_response)
             self.context.add_assistant_message(error_response)
             return error_response
 
@@ -465,7 +740,7 @@ class MCPMultiClient:
         """List all connected servers and their tools"""
         print("\n=== Connected Servers and Tools ===")
         for server_name in self.sessions.keys():
-            server_tools = [tool for tool in self.available_tools if tool["_server"] == server_name]
+            server_tools = self._tools_by_server.get(server_name, ())
             print(f"\n🖥️  {server_name}:")
             for tool in server_tools:
                 print(f"   🔧 {tool['_original_name']}: {tool['description'].replace(f'[{server_name}] ', '')}")
@@ -486,19 +761,20 @@ class MCPMultiClient:
         
         elif subcommand == "show":
             lines = int(parts[2]) if len(parts) > 2 and parts[2].isdigit() else 5
-            messages_to_show = self.context.messages[-lines*2:] if len(self.context.messages) > lines*2 else self.context.messages
+            messages = self.context.messages
+            messages_to_show = list(itertools.islice(messages, max(0, len(messages) - lines*2), None))
             
             if not messages_to_show:
                 return "No hay mensajes en el contexto actual"
             
-            result = f"=== Últimos {len(messages_to_show)} mensajes ===\n"
+            result = [f"=== Últimos {len(messages_to_show)} mensajes ===\n"]
             for msg in messages_to_show:
-                timestamp = msg["timestamp"][:19]  # Solo YYYY-MM-DD HH:MM:SS
+                timestamp = self.context.format_timestamp(msg["ts_ns"])
                 role_icon = "👤" if msg["role"] == "user" else "🤖"
                 content = msg["content"][:100] + "..." if len(msg["content"]) > 100 else msg["content"]
-                result += f"[{timestamp}] {role_icon} {content}\n"
+                result.append(f"[{timestamp}] {role_icon} {content}\n")
             
-            return result
+            return "".join(result)
         
         else:
             return """
@@ -546,7 +822,7 @@ Comandos de logs disponibles:
 
         while True:
             try:
-                query = input(f"\n[{self.context.conversation_id}] 🗣️  Query: ").strip()
+                query = (await ainput(f"\n[{self.context.conversation_id}] 🗣️  Query: ")).strip()
 
                 if query.lower() == 'quit':
                     break
@@ -564,9 +840,9 @@ Comandos de logs disponibles:
                 elif not query:
                     continue
 
-                print("\n🤖 Processing...")
-                response = await self.process_query(query)
-                print(f"\n🤖 Response:\n{response}")
+                # La respuesta se imprime en streaming dentro de process_query
+                print("\n🤖 Response:")
+                await self.process_query(query)
 
             except KeyboardInterrupt:
                 print("\n\n⚠️  Interrupción detectada...")
@@ -580,18 +856,25 @@ Comandos de logs disponibles:
     async def cleanup(self):
         """Clean up resources"""
         self.logger.log_shutdown()
-        await self.exit_stack.aclose()
+        if self._summary_task is not None and not self._summary_task.done():
+            self._summary_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._summary_task
+        try:
+            await self.exit_stack.aclose()
+        finally:
+            self.logger.close()
 
 async def main():
+    if len(sys.argv) < 2:
+        print("Usage:")
+        print("  python client.py <config_file>     # Use configuration file")
+        print("  python client.py <server_script>   # Single server mode (backward compatibility)")
+        return
+    
     client = MCPMultiClient()
     
     try:
-        if len(sys.argv) < 2:
-            print("Usage:")
-            print("  python client.py <config_file>     # Use configuration file")
-            print("  python client.py <server_script>   # Single server mode (backward compatibility)")
-            return
-        
         arg = sys.argv[1]
         
         # Check if argument is a config file or single server script
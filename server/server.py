@@ -1,18 +1,101 @@
 from typing import Any, Dict
+import asyncio
+import functools
 import httpx
 from mcp.server.fastmcp import FastMCP
 import logging
+import heapq
 import re
-from collections import Counter
-import asyncio
-import os
+import time
+from collections import Counter, OrderedDict
+from contextlib import asynccontextmanager
+
+# Optional C JSON parser for API responses (pip install orjson)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Shared HTTP client, reused across tool calls so keep-alive connections
+# to the lyrics API survive between requests
+_http_client: httpx.AsyncClient | None = None
+_active_sessions = 0
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the shared HTTP client, creating it on first use."""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            timeout=30.0,
+            headers={
+                "Accept": "application/json",
+                "User-Agent": "TaylorSwiftMCPAnalyzer/1.0"
+            },
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100)
+        )
+    return _http_client
+
+@asynccontextmanager
+async def http_client_lifespan(server: FastMCP):
+    """Close the shared HTTP client once the last MCP session ends."""
+    global _http_client, _active_sessions
+    _active_sessions += 1
+    try:
+        yield
+    finally:
+        _active_sessions -= 1
+        if _active_sessions == 0 and _http_client is not None:
+            await _http_client.aclose()
+            _http_client = None
 
 # Initialize FastMCP server
-mcp = FastMCP("taylor", host='0.0.0.0', port=8000)
+mcp = FastMCP("taylor", host='0.0.0.0', port=8000, lifespan=http_client_lifespan)
 
 # Constants
 SONGS_API_BASE = "https://api.lyrics.ovh/v1"
 ARTIST = "Taylor Swift"
+LYRICS_CACHE_SIZE = 512
+LYRICS_CACHE_TTL = 3600  # seconds
+REPORT_CACHE_SIZE = 256
+ANALYSIS_CACHE_SIZE = 256
+BATCH_CONCURRENCY = 10
+
+# Word tokenizer, compiled once instead of on every analysis
+_WORD_RE = re.compile(r'\b\w+\b')
+# Whitespace-only line; [^\S\n] keeps a match from spanning several lines
+_BLANK_LINE_RE = re.compile(r'^[^\S\n]*$', re.M)
+
+# Emotional word categories
+_POSITIVE = frozenset({
+    'love', 'happy', 'joy', 'beautiful', 'amazing', 'wonderful', 'perfect', 
+    'bright', 'smile', 'laugh', 'dream', 'hope', 'shine', 'magic', 'sweet'
+})
+
+_NEGATIVE = frozenset({
+    'sad', 'cry', 'pain', 'hurt', 'broken', 'lonely', 'dark', 'tears', 
+    'goodbye', 'lost', 'empty', 'cold', 'afraid', 'sorry', 'mad'
+})
+
+_ROMANTIC = frozenset({
+    'love', 'heart', 'kiss', 'romance', 'forever', 'together', 'soul', 
+    'dear', 'honey', 'mine', 'yours', 'embrace', 'hold', 'close'
+})
+
+# Category bitmask per emotional word (1=positive, 2=negative, 4=romantic);
+# a word like 'love' carries several bits
+_EMOTION_WORDS = _POSITIVE | _NEGATIVE | _ROMANTIC
+_EMO_MASK = {
+    word: (word in _POSITIVE) | (word in _NEGATIVE) << 1 | (word in _ROMANTIC) << 2
+    for word in _EMOTION_WORDS
+}
+
+# Common words excluded from frequency analysis
+_COMMON = frozenset({
+    'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 
+    'by', 'is', 'are', 'was', 'were', 'be', 'been', 'have', 'has', 'had', 
+    'do', 'does', 'did', 'will', 'would', 'could', 'should', 'may', 'might', 
+    'can', 'cant', 'dont', 'wont', 'im', 'youre', 'hes', 'shes', 'its', 'weve'
+})
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -20,26 +103,101 @@ logger = logging.getLogger(__name__)
 
 async def make_song_request(url: str) -> dict[str, Any] | None:
     """Make a request to the lyrics API with proper error handling."""
-    headers = {        
-        "Accept": "application/json",
-        "User-Agent": "TaylorSwiftMCPAnalyzer/1.0"
+    client = get_http_client()
+    try:
+        response = await client.get(url)
+        response.raise_for_status()
+        if orjson is not None:
+            return orjson.loads(response.content)
+        return response.json()
+    except httpx.HTTPStatusError as e:
+        logger.error(f"HTTP error {e.response.status_code} for URL: {url}")
+        return None
+    except Exception as e:
+        logger.error(f"Request error for URL {url}: {str(e)}")
+        return None
+
+# In-process LRU of API responses keyed on the normalized song title. A hit
+# skips the network round-trip entirely; entries expire after LYRICS_CACHE_TTL
+# so songs added or fixed upstream are eventually picked up
+_lyrics_cache: "OrderedDict[str, tuple[float, dict[str, Any]]]" = OrderedDict()
+# Fetches still on the wire, keyed like the cache, so concurrent calls for
+# the same song share a single upstream request
+_inflight_fetches: dict[str, asyncio.Task] = {}
+
+async def _fetch_and_cache(key: str, song_title: str) -> dict[str, Any] | None:
+    """Request a song from the lyrics API and store successful responses in the cache."""
+    response = await make_song_request(url=f"{SONGS_API_BASE}/{ARTIST}/{song_title.strip()}")
+    # Failed requests are not cached so the next call retries
+    if response is not None:
+        _lyrics_cache[key] = (time.monotonic() + LYRICS_CACHE_TTL, response)
+        if len(_lyrics_cache) > LYRICS_CACHE_SIZE:
+            _lyrics_cache.popitem(last=False)
+    return response
+
+async def fetch_song(song_title: str) -> dict[str, Any] | None:
+    """
+    Fetch the lyrics API response for a song, serving repeats from the cache
+    
+    Args:
+        song_title: Title of the Taylor Swift song
+        
+    Returns:
+        The API response, or None if the request failed
+    """
+    key = song_title.strip().lower()
+    cached = _lyrics_cache.get(key)
+    if cached is not None:
+        expires_at, response = cached
+        if expires_at > time.monotonic():
+            _lyrics_cache.move_to_end(key)
+            logger.info(f"Lyrics cache hit for song: {song_title}")
+            return response
+        del _lyrics_cache[key]
+
+    task = _inflight_fetches.get(key)
+    if task is None:
+        task = asyncio.create_task(_fetch_and_cache(key, song_title))
+        _inflight_fetches[key] = task
+        task.add_done_callback(lambda _: _inflight_fetches.pop(key, None))
+    # Shielded so a cancelled caller doesn't cancel the fetch others are awaiting
+    return await asyncio.shield(task)
+
+def _empty_analysis() -> Dict[str, Any]:
+    """Analysis result for lyrics without any words (same shape as a full analysis)."""
+    return {
+        "basic_stats": {
+            "total_words": 0,
+            "unique_words": 0,
+            "lines_count": 0,
+            "vocabulary_density_percent": 0,
+            "repetition_score": 0
+        },
+        "emotional_analysis": {
+            "positive_words_count": 0,
+            "negative_words_count": 0,
+            "romantic_words_count": 0,
+            "emotional_tendency": "neutral",
+            "emotional_intensity": 0
+        },
+        "top_words": [],
+        "song_characteristics": {
+            "is_romantic": False,
+            "is_melancholic": False,
+            "is_upbeat": False,
+            "is_repetitive": False,
+            "is_complex_vocabulary": False
+        }
     }
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(url, headers=headers, timeout=30.0)
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPStatusError as e:
-            logger.error(f"HTTP error {e.response.status_code} for URL: {url}")
-            return None
-        except Exception as e:
-            logger.error(f"Request error for URL {url}: {str(e)}")
-            return None
 
+@functools.lru_cache(maxsize=ANALYSIS_CACHE_SIZE)
 def analyze_lyrics_content(lyrics: str) -> Dict[str, Any]:
     """
     Perform comprehensive analysis of song lyrics
     
+    Results are memoized per lyrics text, so the returned dictionary is
+    shared between callers and must be treated as read-only.
+    
     Args:
         lyrics: The song lyrics text
         
@@ -49,47 +207,34 @@ def analyze_lyrics_content(lyrics: str) -> Dict[str, Any]:
     if not lyrics or lyrics == "Lyrics not found.":
         return {"error": "No lyrics available for analysis"}
     
-    lyrics_lower = lyrics.lower()
-    
-    # Emotional word categories
-    positive_words = {
-        'love', 'happy', 'joy', 'beautiful', 'amazing', 'wonderful', 'perfect', 
-        'bright', 'smile', 'laugh', 'dream', 'hope', 'shine', 'magic', 'sweet'
-    }
-    
-    negative_words = {
-        'sad', 'cry', 'pain', 'hurt', 'broken', 'lonely', 'dark', 'tears', 
-        'goodbye', 'lost', 'empty', 'cold', 'afraid', 'sorry', 'mad'
-    }
-    
-    romantic_words = {
-        'love', 'heart', 'kiss', 'romance', 'forever', 'together', 'soul', 
-        'dear', 'honey', 'mine', 'yours', 'embrace', 'hold', 'close'
-    }
-    
-    # Extract words using regex
-    words = re.findall(r'\b\w+\b', lyrics_lower)
-    word_count = len(words)
-    unique_words = len(set(words))
-    
-    # Count emotional indicators
-    positive_count = sum(1 for word in words if word in positive_words)
-    negative_count = sum(1 for word in words if word in negative_words)
-    romantic_count = sum(1 for word in words if word in romantic_words)
-    
-    # Analyze structure
-    lines = [line.strip() for line in lyrics.split('\n') if line.strip()]
-    
-    # Filter common words for frequency analysis
-    common_words = {
-        'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 
-        'by', 'is', 'are', 'was', 'were', 'be', 'been', 'have', 'has', 'had', 
-        'do', 'does', 'did', 'will', 'would', 'could', 'should', 'may', 'might', 
-        'can', 'cant', 'dont', 'wont', 'im', 'youre', 'hes', 'shes', 'its', 'weve'
-    }
-    
-    meaningful_words = [word for word in words if word not in common_words and len(word) > 2]
-    most_frequent = Counter(meaningful_words).most_common(10)
+    # A whitespace blob has no words: skip tokenizing and report zeroed stats
+    if lyrics.isspace():
+        return _empty_analysis()
+    
+    # Extract words using regex, lowercasing each token rather than copying the whole text
+    counts = Counter(map(str.lower, _WORD_RE.findall(lyrics)))
+    word_count = counts.total()
+    unique_words = len(counts)
+    
+    # Count emotional indicators: one intersection finds the emotional words
+    # present, then each one's bitmask credits every category it belongs to
+    positive_count = negative_count = romantic_count = 0
+    for word in _EMOTION_WORDS.intersection(counts):
+        mask = _EMO_MASK[word]
+        count = counts[word]
+        if mask & 1:
+            positive_count += count
+        if mask & 2:
+            negative_count += count
+        if mask & 4:
+            romantic_count += count
+    
+    # Analyze structure: non-blank lines, counted without splitting the text
+    lines_count = lyrics.count('\n') + 1 - len(_BLANK_LINE_RE.findall(lyrics))
+    
+    meaningful_words = ((word, count) for word, count in counts.items()
+                        if len(word) > 2 and word not in _COMMON)
+    most_frequent = heapq.nlargest(5, meaningful_words, key=lambda item: item[1])
     
     # Determine emotional tendency
     if positive_count > negative_count:
@@ -107,7 +252,7 @@ def analyze_lyrics_content(lyrics: str) -> Dict[str, Any]:
         "basic_stats": {
             "total_words": word_count,
             "unique_words": unique_words,
-            "lines_count": len(lines),
+            "lines_count": lines_count,
             "vocabulary_density_percent": vocabulary_density,
             "repetition_score": round(repetition_score, 3)
         },
@@ -118,7 +263,7 @@ def analyze_lyrics_content(lyrics: str) -> Dict[str, Any]:
             "emotional_tendency": emotional_tendency,
             "emotional_intensity": positive_count + negative_count + romantic_count
         },
-        "top_words": most_frequent[:5],
+        "top_words": most_frequent,
         "song_characteristics": {
             "is_romantic": romantic_count >= 3,
             "is_melancholic": negative_count > positive_count and negative_count >= 2,
@@ -128,6 +273,15 @@ def analyze_lyrics_content(lyrics: str) -> Dict[str, Any]:
         }
     }
 
+# Report label for each song characteristic flag, in display order
+_CHAR_LABELS = (
+    ("is_romantic", "Romantic"),
+    ("is_melancholic", "Melancholic"),
+    ("is_upbeat", "Upbeat"),
+    ("is_repetitive", "Repetitive"),
+    ("is_complex_vocabulary", "Complex vocabulary"),
+)
+
 def format_analysis_summary(song_title: str, analysis: Dict[str, Any]) -> str:
     """
     Format the analysis results into a readable summary
@@ -148,17 +302,7 @@ def format_analysis_summary(song_title: str, analysis: Dict[str, Any]) -> str:
     top_words = analysis["top_words"]
     
     # Build characteristics list
-    char_list = []
-    if characteristics["is_romantic"]:
-        char_list.append("Romantic")
-    if characteristics["is_melancholic"]:
-        char_list.append("Melancholic")
-    if characteristics["is_upbeat"]:
-        char_list.append("Upbeat")
-    if characteristics["is_repetitive"]:
-        char_list.append("Repetitive")
-    if characteristics["is_complex_vocabulary"]:
-        char_list.append("Complex vocabulary")
+    char_list = [label for flag, label in _CHAR_LABELS if characteristics[flag]]
     
     characteristics_str = ", ".join(char_list) if char_list else "Standard pop song structure"
     
@@ -183,10 +327,100 @@ SONG CHARACTERISTICS:
 
 MOST FREQUENT MEANINGFUL WORDS:"""
     
-    for word, count in top_words:
-        summary += f"\n• '{word}' appears {count} times"
+    summary_parts = [summary]
+    summary_parts.extend(f"\n• '{word}' appears {count} times" for word, count in top_words)
+    
+    return "".join(summary_parts).strip()
+
+def format_quick_stats(song_title: str, analysis: Dict[str, Any]) -> str:
+    """
+    Format the basic statistics of an analysis into a short summary
+    
+    Args:
+        song_title: Name of the analyzed song
+        analysis: Analysis results dictionary
+        
+    Returns:
+        Formatted quick stats string
+    """
+    if "error" in analysis:
+        return f"Analysis failed: {analysis['error']}"
+    
+    stats = analysis["basic_stats"]
+    emotions = analysis["emotional_analysis"]
+    
+    return f"""
+QUICK STATS for '{song_title.upper()}':
+• Words: {stats['total_words']} total, {stats['unique_words']} unique
+• Lines: {stats['lines_count']}
+• Vocabulary density: {stats['vocabulary_density_percent']}%
+• Emotional tendency: {emotions['emotional_tendency']}
+• Emotional intensity: {emotions['emotional_intensity']}
+"""
+
+_REPORT_FORMATTERS = {
+    "full": format_analysis_summary,
+    "stats": format_quick_stats,
+}
+
+# Formatted reports keyed on (kind, title, lyrics), shared by analyze_song and
+# get_song_stats_only so repeat calls skip the formatting. Keyed on the text
+# itself like analyze_lyrics_content's cache: str caches its hash and the key
+# holds the same string object the lyrics cache already keeps alive
+_report_cache: "OrderedDict[tuple[str, str, str], str]" = OrderedDict()
+
+def _build_report(kind: str, song_title: str, lyrics: str) -> str:
+    """Analyze lyrics and format them as the requested report kind."""
+    return _REPORT_FORMATTERS[kind](song_title, analyze_lyrics_content(lyrics))
+
+async def render_report(kind: str, song_title: str, lyrics: str) -> str:
+    """
+    Return a formatted analysis report, reusing a cached one when available
+    
+    Args:
+        kind: "full" for the complete analysis, "stats" for quick stats
+        song_title: Name of the analyzed song
+        lyrics: The song lyrics text
+        
+    Returns:
+        Formatted report string
+    """
+    key = (kind, song_title, lyrics)
+    report = _report_cache.get(key)
+    if report is not None:
+        _report_cache.move_to_end(key)
+        return report
+    
+    # Analysis runs in a worker thread so other tool calls keep running
+    report = await asyncio.to_thread(_build_report, kind, song_title, lyrics)
+    _report_cache[key] = report
+    if len(_report_cache) > REPORT_CACHE_SIZE:
+        _report_cache.popitem(last=False)
+    return report
+
+async def build_song_analysis(song_title: str) -> str:
+    """
+    Fetch a song and build its full analysis report
+    
+    Args:
+        song_title: Title of the Taylor Swift song to analyze
+        
+    Returns:
+        Detailed analysis report or error message
+    """
+    # Fetch lyrics
+    response = await fetch_song(song_title)
+
+    if response is None:
+        return f"Unable to fetch data for '{song_title}'. Please verify the song title."
+
+    lyrics = response.get("lyrics", "")
     
-    return summary.strip()
+    if not lyrics or lyrics == "Lyrics not found.":
+        return f"No lyrics available for analysis of '{song_title}'"
+    
+    # Perform analysis and format the results
+    return await render_report("full", song_title, lyrics)
 
 @mcp.tool()
 async def get_song_lyrics(song_title: str) -> str:
@@ -199,12 +433,11 @@ async def get_song_lyrics(song_title: str) -> str:
     Returns:
         The song lyrics or error message
     """
-    songs_url = f"{SONGS_API_BASE}/{ARTIST}/{song_title}"
     logger.info(f"Fetching lyrics for song: {song_title}")
 
-    response = await make_song_request(url=songs_url)
+    response = await fetch_song(song_title)
 
-    if not response:
+    if response is None:
         return f"Unable to fetch lyrics for '{song_title}'. Please check the song title spelling."
 
     lyrics = response.get("lyrics", "Lyrics not found.")
@@ -230,25 +463,116 @@ async def analyze_song(song_title: str) -> str:
     Returns:
         Detailed analysis report
     """
-    songs_url = f"{SONGS_API_BASE}/{ARTIST}/{song_title}"
     logger.info(f"Analyzing song: {song_title}")
 
-    # Fetch lyrics
-    response = await make_song_request(url=songs_url)
+    return await build_song_analysis(song_title)
 
-    if not response:
-        return f"Unable to fetch data for '{song_title}'. Please verify the song title."
 
-    lyrics = response.get("lyrics", "")
+@mcp.tool()
+async def analyze_songs(song_titles: list[str]) -> str:
+    """
+    Perform comprehensive analysis of several Taylor Swift songs at once,
+    fetching and analyzing them concurrently
     
-    if not lyrics or lyrics == "Lyrics not found.":
-        return f"No lyrics available for analysis of '{song_title}'"
+    Args:
+        song_titles: Titles of the Taylor Swift songs to analyze
+        
+    Returns:
+        One detailed analysis report per song
+    """
+    if not song_titles:
+        return "No song titles provided for analysis"
+    
+    logger.info(f"Analyzing {len(song_titles)} songs")
+
+    # Bound the fan-out so a long list doesn't flood the lyrics API
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def analyze_one(song_title: str) -> str:
+        async with semaphore:
+            return await build_song_analysis(song_title)
+
+    reports = await asyncio.gather(*map(analyze_one, song_titles))
+    
+    return f"\n\n{'=' * 40}\n\n".join(reports)
+
+
+def _leader(song1: str, value1: float, song2: str, value2: float) -> str:
+    """Name the song with the higher value, or report a tie"""
+    if value1 > value2:
+        return song1
+    if value2 > value1:
+        return song2
+    return "Tie"
+
+@mcp.tool()
+async def compare_songs(song1: str, song2: str) -> str:
+    """
+    Compare two Taylor Swift songs across statistics, emotional profile
+    and characteristics
     
-    # Perform analysis
-    analysis = analyze_lyrics_content(lyrics)
+    Args:
+        song1: Title of the first Taylor Swift song
+        song2: Title of the second Taylor Swift song
+        
+    Returns:
+        Comparative analysis report
+    """
+    logger.info(f"Comparing songs: {song1} vs {song2}")
+
+    # Fetch both songs concurrently
+    response1, response2 = await asyncio.gather(fetch_song(song1), fetch_song(song2))
+
+    for song_title, response in ((song1, response1), (song2, response2)):
+        if response is None:
+            return f"Unable to fetch data for '{song_title}'. Please verify the song title."
     
-    # Format and return results
-    return format_analysis_summary(song_title, analysis)
+    # Analyze both songs off the event loop, concurrently
+    analysis1, analysis2 = await asyncio.gather(
+        asyncio.to_thread(analyze_lyrics_content, response1.get("lyrics", "")),
+        asyncio.to_thread(analyze_lyrics_content, response2.get("lyrics", ""))
+    )
+    
+    for song_title, analysis in ((song1, analysis1), (song2, analysis2)):
+        if "error" in analysis:
+            return f"Comparison failed for '{song_title}': {analysis['error']}"
+    
+    stats1, stats2 = analysis1["basic_stats"], analysis2["basic_stats"]
+    emotions1, emotions2 = analysis1["emotional_analysis"], analysis2["emotional_analysis"]
+    
+    density_leader = _leader(song1, stats1["vocabulary_density_percent"], song2, stats2["vocabulary_density_percent"])
+    intensity_leader = _leader(song1, emotions1["emotional_intensity"], song2, emotions2["emotional_intensity"])
+    repetition_leader = _leader(song1, stats1["repetition_score"], song2, stats2["repetition_score"])
+    
+    comparison = f"""
+TAYLOR SWIFT SONG COMPARISON: '{song1.upper()}' vs '{song2.upper()}'
+
+BASIC STATISTICS:
+• Total words: {stats1['total_words']} vs {stats2['total_words']}
+• Unique words: {stats1['unique_words']} vs {stats2['unique_words']}
+• Lines: {stats1['lines_count']} vs {stats2['lines_count']}
+• Vocabulary density: {stats1['vocabulary_density_percent']}% vs {stats2['vocabulary_density_percent']}%
+
+EMOTIONAL PROFILE:
+• Overall tendency: {emotions1['emotional_tendency'].upper()} vs {emotions2['emotional_tendency'].upper()}
+• Positive indicators: {emotions1['positive_words_count']} vs {emotions2['positive_words_count']}
+• Negative indicators: {emotions1['negative_words_count']} vs {emotions2['negative_words_count']}
+• Romantic elements: {emotions1['romantic_words_count']} vs {emotions2['romantic_words_count']}
+
+VERDICT:
+• Richer vocabulary: {density_leader}
+• More emotionally intense: {intensity_leader}
+• More repetitive: {repetition_leader}
+
+SHARED TOP WORDS:"""
+    
+    top_words2 = dict(analysis2["top_words"])
+    comparison_parts = [comparison]
+    comparison_parts.extend(f"\n• '{word}'" for word, _ in analysis1["top_words"] if word in top_words2)
+    if len(comparison_parts) == 1:
+        comparison_parts.append("\n• None")
+    
+    return "".join(comparison_parts).strip()
 
 
 @mcp.tool()
@@ -262,12 +586,11 @@ async def get_song_stats_only(song_title: str) -> str:
     Returns:
         Basic statistics summary
     """
-    songs_url = f"{SONGS_API_BASE}/{ARTIST}/{song_title}"
     logger.info(f"Getting stats for song: {song_title}")
 
-    response = await make_song_request(url=songs_url)
+    response = await fetch_song(song_title)
 
-    if not response:
+    if response is None:
         return f"Unable to fetch data for '{song_title}'"
 
     lyrics = response.get("lyrics", "")
@@ -275,24 +598,8 @@ async def get_song_stats_only(song_title: str) -> str:
     if not lyrics:
         return f"No lyrics available for '{song_title}'"
     
-    analysis = analyze_lyrics_content(lyrics)
-    
-    if "error" in analysis:
-        return f"Analysis failed: {analysis['error']}"
-    
-    stats = analysis["basic_stats"]
-    emotions = analysis["emotional_analysis"]
-    
-    return f"""
-QUICK STATS for '{song_title.upper()}':
-• Words: {stats['total_words']} total, {stats['unique_words']} unique
-• Lines: {stats['lines_count']}
-• Vocabulary density: {stats['vocabulary_density_percent']}%
-• Emotional tendency: {emotions['emotional_tendency']}
-• Emotional intensity: {emotions['emotional_intensity']}
-"""
+    return await render_report("stats", song_title, lyrics)
 
-from fastmcp import FastMCP
 
 if __name__ == "__main__":
     logger.info("Starting Taylor Swift MCP Analysis Server...")